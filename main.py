@@ -9,13 +9,18 @@ AI Blog Generator with UI (Cover Image Generated Based on Title) - Bilingual Com
   3. 封面图片（使用 GPT-4o（通过 DALL·E-3 接口）生成），要求图片背景简单优雅，
      并在图片中央以大字显示生成的博客标题（title）——即按 title 生成图片
   4. 注释说明（使用 GPT-3.5-turbo 生成，描述该结果的独特创意特点）
+其中 3 套结果的标题、正文和注释通过一次 JSON 模式的 GPT-3.5-turbo 调用（n=3）同时生成。
 所有结果整合保存为 Word 文档（默认文件名 "generated_blog.docx"）。
 程序提供简单的 Tkinter UI 界面，用户无需命令行操作即可使用。
 
 Dependencies:
-  - openai
+  - openai (>= 1.0，使用 AsyncOpenAI 异步客户端 / uses the AsyncOpenAI client)
   - python-docx
   - requests
+  - tenacity
+  - aiolimiter
+  - orjson
+  - diskcache
   - Pillow
   - Tkinter (通常内置于 Python)
 
@@ -23,149 +28,656 @@ Dependencies:
 """
 
 import os
-import time
+import re
+import io
+import shutil
+import queue
+import hashlib
+import asyncio
 import threading
-import openai
-import requests
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from aiolimiter import AsyncLimiter
+from tenacity import (
+    retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+)
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
-from docx import Document
-from docx.shared import Inches
+
+# 注意：openai、requests、python-docx（及其依赖 lxml）和 Pillow 导入开销较大，
+# 均在首次使用时才导入，使 UI 窗口能够立即显示。
+# Note: openai, requests, python-docx (and its lxml dependency) and Pillow are slow to import,
+# so they are imported on first use and the UI window appears immediately.
 
 # -------------------------------------------------------------------
 # API Key 设置 / API Key Configuration
 # -------------------------------------------------------------------
-openai.api_key = ("Please input your API key here")
+OPENAI_API_KEY = "Please input your API key here"
+# 请确保上述 API Key 正确且安全
+_client = None
 
 
-# 请确保上述 API Key 正确且安全
+def get_client():
+    """
+    返回共享的 AsyncOpenAI 客户端（首次调用时创建）。其内部 httpx 连接池在所有请求之间复用
+    TCP/TLS 连接；SDK 内置重试已关闭，统一由下方的 tenacity 策略处理。仅在后台事件循环中调用。
+    Return the shared AsyncOpenAI client, created on first use. Its internal httpx pool reuses
+    TCP/TLS connections across calls; SDK retries are off since the tenacity policy below owns
+    retrying. Only called from the background event loop.
+    """
+    global _client
+    if _client is None:
+        import openai
+        _client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+    return _client
+
+
+# 常驻后台事件循环：客户端连接池绑定在同一个循环上，多次点击生成时可持续复用。
+# Long-lived background event loop, so the client's pool stays valid across repeated runs.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, daemon=True).start()
+
+
+# -------------------------------------------------------------------
+# 提示模板 / Prompt Templates
+# -------------------------------------------------------------------
+# 模块级模板集中管理所有提示，便于统一修改或缩短提示以减少输入 token。
+# All prompts live here as module-level templates, so they can be edited (or shortened to
+# save input tokens) in one place.
+_SYSTEM_PROMPT = "You are a helpful text generation assistant."
+
+_BUNDLE_PROMPT = (
+    "For the blog topic '{topic}', produce a unique and creative blog result. "
+    "Respond with a JSON object containing exactly these string fields:\n"
+    '  "title": an attractive blog title - short, creative, and captivating;\n'
+    '  "content": an engaging English blog post that includes an introduction, a main body, and a '
+    "conclusion, between 500 to 800 words, logically structured, and including personal opinions;\n"
+    '  "annotation": a one-sentence annotation describing the unique creative features of this '
+    "blog result."
+)
+
+_COVER_PROMPT = (
+    "Generate a 1024x1024 cover image with a simple, elegant background pattern. "
+    "In the center, display the following text in large, bold letters: \"{title}\". "
+    "This is for variant {set_no}; vary the background style (different colors or patterns) "
+    "but ensure the displayed text is exactly the given title."
+)
+
+
+# -------------------------------------------------------------------
+# 图片下载 HTTP 会话 / Pooled HTTP Session for Image Downloads
+# -------------------------------------------------------------------
+_http = None
+_http_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    返回共享的 requests 会话（首次调用时创建，线程安全）。复用 keep-alive 连接，
+    避免每张图片重复 TCP/TLS 握手；对 429/5xx 自动指数退避重试。
+    Return the shared requests session, created on first use (thread-safe). It reuses keep-alive
+    connections across downloads and retries 429/5xx with exponential backoff.
+    """
+    global _http
+    with _http_lock:
+        if _http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=4,
+                max_retries=Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504])
+            ))
+            _http = session
+    return _http
+
+
+# 专用下载线程池：3 套结果的图片下载并行进行，共享上面的连接池。
+# Dedicated download pool so the 3 cover downloads run in parallel over the session above.
+_download_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="download")
+
+# -------------------------------------------------------------------
+# 本地请求缓存 / On-Disk Cache for Repeated Prompts
+# -------------------------------------------------------------------
+# 以请求参数为键缓存文本结果与封面图片字节，重复生成相同主题时无需再次调用 API。
+# Text results and cover image bytes are cached by request parameters, so regenerating the
+# same topic skips the API entirely. Opt-in from the UI since sampling uses temperature > 0.
+# 缓存目录与 SQLite 数据库仅在缓存开启后首次访问时创建。
+# The cache directory and SQLite database are only created on first access with caching enabled.
+CACHE_DIR = ".llm_cache"
+_cache = None
+_cache_lock = threading.Lock()
+cache_enabled = False
+
+
+def _get_cache():
+    """
+    返回本地缓存（首次调用时导入 diskcache 并打开，线程安全）。
+    Return the on-disk cache, importing diskcache and opening it on first use (thread-safe).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            import diskcache
+            _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def cache_key(payload: dict) -> str:
+    """
+    根据请求参数计算稳定的缓存键。
+    Compute a stable cache key from the request parameters.
+    """
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def cache_get(key: str):
+    """
+    缓存开启时返回缓存值，否则（或未命中时）返回 None。
+    Return the cached value when caching is enabled, otherwise (or on a miss) None.
+    """
+    return _get_cache().get(key) if cache_enabled else None
+
+
+def cache_set(key: str, value):
+    """
+    缓存开启时写入缓存。
+    Store the value when caching is enabled.
+    """
+    if cache_enabled:
+        _get_cache()[key] = value
+
 
 # -------------------------------------------------------------------
 # UI 日志输出辅助函数 / Append Log to UI
 # -------------------------------------------------------------------
+# Tk 控件不是线程安全的：工作线程只把消息放入队列，由 Tk 主线程定时批量写入文本框。
+# Tk widgets are not thread-safe: worker threads only enqueue messages, and the Tk thread
+# drains the queue periodically, inserting them in one batch.
+_log_q = queue.Queue()
+_ui_q = queue.Queue()
+LOG_DRAIN_INTERVAL_MS = 100
+
+
 def append_log(message: str):
     """
-    将日志消息追加到 UI 的滚动文本框中。
-    Append log messages to the UI's scrolled text widget.
+    将日志消息放入队列，稍后由 Tk 主线程追加到 UI 的滚动文本框中（可在任意线程调用）。
+    Queue a log message to be appended to the UI's scrolled text widget by the Tk thread
+    (safe to call from any thread).
+    """
+    _log_q.put(message)
+
+
+def run_on_ui(callback):
+    """
+    将一个无参可调用对象放入队列，由 Tk 主线程在写完已排队的日志后执行（可在任意线程调用）。
+    Queue a no-argument callable for the Tk thread to run after the pending log messages
+    (safe to call from any thread).
+    """
+    _ui_q.put(callback)
+
+
+def _drain_log():
     """
-    global log_text
-    if log_text:
-        log_text.insert(tk.END, message)
-        log_text.see(tk.END)
+    在 Tk 主线程中取出所有待写日志，一次性插入文本框，再执行排队的 UI 回调，然后重新调度自身。
+    On the Tk thread, take all pending log messages and insert them in one go, run the queued
+    UI callbacks, then reschedule.
+    """
+    try:
+        msgs = []
+        try:
+            while True:
+                msgs.append(_log_q.get_nowait())
+        except queue.Empty:
+            pass
+        if msgs:
+            log_text.insert(tk.END, "".join(msgs))
+            log_text.see(tk.END)
+        while True:
+            try:
+                callback = _ui_q.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback()
+            except Exception as e:
+                # 单个回调出错不影响其余回调 / One failing callback must not block the others
+                append_log(f"UI update failed: {e}\n")
+    finally:
+        # 无论如何都要重新调度，否则之后的日志和按钮更新都会丢失
+        # Always reschedule, otherwise all later log messages and button updates would be lost
+        root.after(LOG_DRAIN_INTERVAL_MS, _drain_log)
 
 
 # -------------------------------------------------------------------
-# 通用文本生成函数 / General Text Generation Function (GPT-3.5-turbo)
+# OpenAI 速率限制（令牌桶）/ Token-Bucket Rate Limits for OpenAI Calls
+# -------------------------------------------------------------------
+# 仅在额度耗尽时才等待，取代固定的 sleep；数值可在 UI 中按账户等级调整。
+# Throttle only when the budget is used up; values are adjustable in the UI to match the account tier.
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 3000
+DEFAULT_MAX_TOKENS_PER_MINUTE = 900_000
+RPM_LIMITER = AsyncLimiter(DEFAULT_MAX_REQUESTS_PER_MINUTE, 60)
+TPM_LIMITER = AsyncLimiter(DEFAULT_MAX_TOKENS_PER_MINUTE, 60)
+
+
+def configure_rate_limits(max_requests_per_minute: int, max_tokens_per_minute: int):
+    """
+    按给定的每分钟请求数 / token 数重建令牌桶（数值未变化时保留原有桶）。
+    Rebuild the token buckets for the given per-minute request / token budgets
+    (existing buckets are kept when the values are unchanged).
+    """
+    global RPM_LIMITER, TPM_LIMITER
+    if RPM_LIMITER.max_rate != max_requests_per_minute:
+        RPM_LIMITER = AsyncLimiter(max_requests_per_minute, 60)
+    if TPM_LIMITER.max_rate != max_tokens_per_minute:
+        TPM_LIMITER = AsyncLimiter(max_tokens_per_minute, 60)
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """
+    粗略估算一次请求消耗的 token（约 4 个字符 1 个 token，加上输出上限）。
+    Roughly estimate a request's token usage (~4 characters per token plus the output limit).
+    """
+    return len(prompt) // 4 + max_tokens
+
+
 # -------------------------------------------------------------------
-def generate_text(prompt: str, max_tokens: int) -> str:
+# OpenAI 调用重试策略 / Retry Policy for OpenAI Calls
+# -------------------------------------------------------------------
+RETRY_MAX_WAIT = 30  # 单次重试等待上限（秒）/ Upper bound for a single retry wait, in seconds
+_backoff = wait_exponential_jitter(initial=1, max=RETRY_MAX_WAIT)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """
+    优先使用服务端返回的 Retry-After 提示作为等待时间（不超过 RETRY_MAX_WAIT，避免配额类 429 导致长时间等待），
+    否则使用带抖动的指数退避。
+    Wait for the server's Retry-After hint when present (capped at RETRY_MAX_WAIT so a quota-style 429
+    cannot stall the run for hours), otherwise use jittered exponential backoff.
     """
-    使用 OpenAI ChatCompletion 接口生成文本，基于 GPT-3.5-turbo 模型。
-    Generate text using OpenAI's ChatCompletion API with GPT-3.5-turbo.
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    if response is not None:
+        retry_after_ms = response.headers.get("retry-after-ms")
+        retry_after = response.headers.get("retry-after")
+        try:
+            if retry_after_ms:
+                return min(float(retry_after_ms) / 1000, RETRY_MAX_WAIT)
+            if retry_after:
+                return min(float(retry_after), RETRY_MAX_WAIT)
+        except ValueError:
+            pass
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state):
+    """
+    在每次重试等待前将原因写入 UI 日志。
+    Log the reason to the UI before each retry wait.
+    """
+    append_log(
+        f"{retry_state.fn.__name__} failed ({retry_state.outcome.exception()!r}). "
+        f"Retrying in {retry_state.next_action.sleep:.1f} seconds...\n"
+    )
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """
+    判断是否为可重试的 OpenAI 错误（限流、超时、连接错误、5xx 服务端错误）。
+    Whether the exception is a retryable OpenAI error (rate limit, timeout, connection error, 5xx).
+    """
+    import openai
+    return isinstance(exc, (
+        openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError
+    ))
+
+
+openai_retry = retry(
+    retry=retry_if_exception(_is_transient_error),
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(6),
+    before_sleep=_log_retry,
+    reraise=True
+)
+
+
+# -------------------------------------------------------------------
+# 构建文本请求体 / Build Chat Completion Request Body
+# -------------------------------------------------------------------
+def build_text_payload(prompt: str, max_tokens: int, json_mode: bool = False,
+                       n: int = 1, temperature: float = 0.7) -> dict:
+    """
+    构建 GPT-3.5-turbo 的 ChatCompletion 请求体，实时调用与 Batch API 共用。
+    Build the GPT-3.5-turbo ChatCompletion request body, shared by real-time calls and the Batch API.
 
     Args:
       prompt (str): 输入提示 / Input prompt.
-      max_tokens (int): 最大 token 数限制 / Maximum tokens.
+      max_tokens (int): 每个结果的最大 token 数 / Maximum tokens per completion.
+      json_mode (bool): 是否要求模型输出 JSON 对象 / Ask the model to return a JSON object.
+      n (int): 一次请求返回的结果数量 / Number of completions returned by one request.
+      temperature (float): 采样温度 / Sampling temperature.
 
     Returns:
-      result (str): 生成的文本 / Generated text.
+      payload (dict): 请求体 / Request body.
     """
     payload = {
         "model": "gpt-3.5-turbo",
         "messages": [
-            {"role": "system", "content": "You are a helpful text generation assistant."},
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         "max_tokens": max_tokens,
-        "temperature": 0.7
+        "temperature": temperature,
+        "n": n
     }
-    while True:
-        try:
-            response = openai.ChatCompletion.create(**payload)
-            result = response["choices"][0]["message"]["content"].strip()
-            return result
-        except openai.error.RateLimitError:
-            append_log("Text generation rate limit reached. Waiting 10 seconds...\n")
-            time.sleep(10)
-        except Exception as e:
-            append_log(f"Error generating text: {e}. Retrying in 10 seconds...\n")
-            time.sleep(10)
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    return payload
 
 
 # -------------------------------------------------------------------
-# 生成博客标题 / Generate Blog Title
+# 通用文本生成函数 / General Text Generation Function (GPT-3.5-turbo)
 # -------------------------------------------------------------------
-def generate_blog_title(topic: str, set_no: int) -> str:
+@openai_retry
+async def generate_texts(prompt: str, max_tokens: int, json_mode: bool = False,
+                         n: int = 1, temperature: float = 0.7, on_progress=None, on_start=None) -> list:
     """
-    根据博客主题生成一个独特的英文博客标题，并加入结果集编号保证独特性。
-    Generate a unique blog title based on the given topic.
-    Include the set number to ensure each title is unique.
+    使用 OpenAI ChatCompletion 接口生成文本，基于 GPT-3.5-turbo 模型。通过 n 参数一次请求得到多个结果，
+    输入 token 只计费一次。JSON 模式下仅缓存可解析的结果。提供 on_progress 时以流式方式接收，
+    调用方可以在其余内容仍在生成时处理已收到的部分。
+    Generate text using OpenAI's ChatCompletion API with GPT-3.5-turbo. The n parameter returns several
+    completions from one request, with input tokens billed once. In JSON mode only parseable results
+    are cached. When on_progress is given the response is streamed, so callers can act on partial
+    output while the rest is still being generated.
 
     Args:
-      topic (str): 博客主题 / Blog topic.
-      set_no (int): 结果集编号 / Set number.
+      prompt (str): 输入提示 / Input prompt.
+      max_tokens (int): 每个结果的最大 token 数 / Maximum tokens per completion.
+      json_mode (bool): 是否要求模型输出 JSON 对象 / Ask the model to return a JSON object.
+      n (int): 返回结果数量 / Number of completions.
+      temperature (float): 采样温度 / Sampling temperature.
+      on_progress (callable): 可选，每收到一段内容即以 (index, 已接收文本, False) 调用；
+                              命中缓存时以 (index, 完整结果, True) 调用一次
+                              / Optional; called with (index, text so far, False) after each streamed
+                              piece, or once per result with (index, full text, True) on a cache hit.
+      on_start (callable): 可选，每次尝试（包括 tenacity 重试）开始时无参调用，用于重置按结果累积的状态
+                           / Optional; called with no arguments at the start of every attempt (including
+                           tenacity retries) so per-result state built from on_progress can be reset.
 
     Returns:
-      title (str): 生成的博客标题 / Generated blog title.
+      results (list): n 个生成的文本 / The n generated texts.
+
+    Raises:
+      orjson.JSONDecodeError: JSON 模式下返回内容不是合法 JSON 时 / If a JSON-mode result is not valid JSON.
     """
-    prompt = (
-        f"Please generate an attractive blog title for the following topic: '{topic}'. "
-        f"This is for result set {set_no}, so ensure it is unique and creative. "
-        "Requirements: short, creative, and captivating."
-    )
-    return generate_text(prompt, max_tokens=50)
+    if on_start is not None:
+        on_start()
+    payload = build_text_payload(prompt, max_tokens, json_mode, n, temperature)
+    key = cache_key(payload)
+    cached = cache_get(key)
+    if cached is not None:
+        if on_progress is not None:
+            for index, result in enumerate(cached):
+                on_progress(index, result, True)
+        return cached
+    async with RPM_LIMITER:
+        await TPM_LIMITER.acquire(min(estimate_tokens(prompt, max_tokens * n), TPM_LIMITER.max_rate))
+        if on_progress is None:
+            response = await get_client().chat.completions.create(**payload)
+            results = [choice.message.content.strip() for choice in response.choices]
+        else:
+            buffers = [""] * n
+            stream = await get_client().chat.completions.create(**payload, stream=True)
+            async for chunk in stream:
+                for choice in chunk.choices:
+                    piece = choice.delta.content or ""
+                    if piece:
+                        buffers[choice.index] += piece
+                        on_progress(choice.index, buffers[choice.index], False)
+            results = [buffer.strip() for buffer in buffers]
+    if json_mode:
+        for result in results:
+            orjson.loads(result)
+    cache_set(key, results)
+    return results
 
 
 # -------------------------------------------------------------------
-# 生成博客正文 / Generate Blog Content
+# 生成博客标题、正文与注释 / Generate Blog Title, Content and Annotation
 # -------------------------------------------------------------------
-def generate_blog_content(topic: str, set_no: int) -> str:
+SET_COUNT = 3
+BUNDLE_MAX_TOKENS = 1800
+BUNDLE_MAX_ATTEMPTS = 3  # 返回非法 JSON（如被截断）时的最大尝试次数 / Max attempts on invalid (e.g. truncated) JSON
+BUNDLE_TEMPERATURE = 0.9  # 较高温度使同一请求的 n 个结果各不相同 / Higher temperature keeps the n results distinct
+
+STREAM_PROGRESS_CHARS = 1000  # 每收到约这么多字符输出一次进度 / Log progress about every this many characters
+
+# 匹配流式输出中已完整接收的 "title" 字段 / Matches a fully received "title" field in streamed output
+_STREAM_TITLE_RE = re.compile(r'"title"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def build_bundle_prompt(topic: str) -> str:
     """
-    根据博客主题生成一篇完整的英文博客文章（包含引言、正文和结尾），并加入结果集编号确保每组内容独特。
-    Generate an engaging English blog post on the given topic including introduction, body, and conclusion.
-    Include the set number for uniqueness.
+    构建同时生成标题、正文和注释的 JSON 模式提示。
+    Build the JSON-mode prompt asking for title, content and annotation at once.
 
     Args:
       topic (str): 博客主题 / Blog topic.
-      set_no (int): 结果集编号 / Set number.
 
     Returns:
-      content (str): 生成的博客正文 / Generated blog content.
+      prompt (str): 提示文本 / Prompt text.
     """
-    prompt = (
-        f"Write an engaging English blog post about '{topic}' for result set {set_no} that includes an introduction, "
-        "a main body, and a conclusion. The post should be between 500 to 800 words, logically structured, "
-        "and include personal opinions. Ensure it is uniquely different from other sets."
-    )
-    return generate_text(prompt, max_tokens=1500)
+    return _BUNDLE_PROMPT.format(topic=topic)
+
+
+def parse_bundle(raw: str) -> dict:
+    """
+    解析模型返回的 JSON 文本，提取 'title', 'content', 'annotation' 三个字段。
+    Parse the model's JSON output into a dict with keys 'title', 'content', 'annotation'.
+
+    Raises:
+      orjson.JSONDecodeError: 当返回内容不是合法 JSON 时 / If the output is not valid JSON.
+    """
+    data = orjson.loads(raw)
+    return {key: str(data.get(key, "")).strip() for key in ("title", "content", "annotation")}
+
+
+async def generate_blog_bundles(topic: str, n: int = SET_COUNT, on_title=None) -> list:
+    """
+    通过一次 ChatCompletion（JSON 模式，n 个结果）同时生成 n 套博客标题、正文和注释说明。
+    提供 on_title 时以流式方式接收，每套结果的标题一旦完整输出即回调，无需等待正文生成完毕。
+    Generate n sets of blog title, content and annotation in a single JSON-mode ChatCompletion
+    call that returns n completions. When on_title is given the response is streamed and on_title
+    fires as soon as each set's title has been emitted, without waiting for the content.
+
+    Args:
+      topic (str): 博客主题 / Blog topic.
+      n (int): 结果集数量 / Number of result sets.
+      on_title (callable): 可选，以 (set_no, title) 调用 / Optional; called with (set_no, title).
+
+    Returns:
+      bundles (list): 每个元素为包含 'title', 'content', 'annotation' 的字典
+                      / Dicts with keys: 'title', 'content', 'annotation'.
+
+    Raises:
+      orjson.JSONDecodeError: 连续 BUNDLE_MAX_ATTEMPTS 次返回非法 JSON 时
+                              / If the output is invalid JSON BUNDLE_MAX_ATTEMPTS times in a row.
+    """
+    prompt = build_bundle_prompt(topic)
+    titled = set()
+    logged_chars = {}
+
+    def on_start():
+        # 每次尝试（含流式中途失败后的重试）都重新检测标题 / Re-detect titles on every attempt, including retries
+        titled.clear()
+        logged_chars.clear()
+
+    def on_progress(index: int, text: str, from_cache: bool):
+        # 按结果集输出可读的进度行（缓存命中时并无流式传输，不输出）
+        # Log a readable per-set progress line (not on a cache hit, where nothing streamed)
+        if not from_cache and len(text) - logged_chars.get(index, 0) >= STREAM_PROGRESS_CHARS:
+            logged_chars[index] = len(text)
+            append_log(f"[Set {index + 1}] Streaming... {len(text)} characters received\n")
+        if index in titled:
+            return
+        match = _STREAM_TITLE_RE.search(text)
+        if match:
+            titled.add(index)
+            try:
+                on_title(index + 1, orjson.loads(f'"{match.group(1)}"').strip())
+            except orjson.JSONDecodeError:
+                pass
+
+    for attempt in range(1, BUNDLE_MAX_ATTEMPTS + 1):
+        try:
+            raws = await generate_texts(prompt, BUNDLE_MAX_TOKENS, json_mode=True, n=n,
+                                        temperature=BUNDLE_TEMPERATURE,
+                                        on_progress=on_progress if on_title else None,
+                                        on_start=on_start)
+            return [parse_bundle(raw) for raw in raws]
+        except orjson.JSONDecodeError as e:
+            # 每次重试都会重新计费整个请求，因此限制次数 / Each retry re-bills the whole request, so cap it
+            if attempt == BUNDLE_MAX_ATTEMPTS:
+                raise
+            append_log(f"Invalid JSON in blog bundles (attempt {attempt}/{BUNDLE_MAX_ATTEMPTS}): {e}. Retrying...\n")
 
 
 # -------------------------------------------------------------------
-# 生成注释说明 / Generate Annotation
+# 使用 Batch API 批量生成 / Generate Bundles via the OpenAI Batch API
 # -------------------------------------------------------------------
-def generate_annotation(topic: str, title: str, set_no: int) -> str:
+BATCH_POLL_INTERVAL = 30  # 轮询间隔（秒）/ Polling interval in seconds
+# 批任务相关调用不经过 tenacity，改用 SDK 内置重试（限流、超时、连接错误、5xx），避免一次网络抖动中断长时间轮询
+# Batch calls bypass tenacity and use the SDK's own retries (429, timeouts, connection errors, 5xx),
+# so a single network blip cannot abort a long polling run
+BATCH_MAX_RETRIES = 5
+
+
+async def generate_blog_bundles_batch(topic: str, n: int = SET_COUNT) -> list:
     """
-    根据博客主题和生成的标题生成一段注释说明，描述该结果的独特创意特点。
-    Generate a brief annotation describing the unique creative features of this blog result.
+    将 n 套结果的 ChatCompletion 请求（n 个结果）作为 JSONL 批任务提交到 Batch API（费用减半，最长 24 小时完成），
+    每 30 秒轮询一次状态，完成后解析结果。批任务失败或请求已在缓存中时返回空列表（实时路径会处理）。
+    Submit the n-completion chat request as a JSONL Batch API job (half the token cost, up to 24h
+    turnaround), poll every 30 seconds, and parse the output. Returns an empty list when the batch
+    fails or the request is already cached (the real-time path handles those).
 
     Args:
       topic (str): 博客主题 / Blog topic.
-      title (str): 生成的博客标题 / Generated blog title.
-      set_no (int): 结果集编号 / Set number.
+      n (int): 结果集数量 / Number of result sets.
 
     Returns:
-      annotation (str): 生成的注释说明 / Generated annotation.
+      bundles (list): 同 generate_blog_bundles / Same as generate_blog_bundles.
     """
-    prompt = (
-        f"Given the blog title '{title}' for the topic '{topic}', please provide a one-sentence annotation "
-        f"describing the unique creative features of this blog result (Set {set_no})."
+    body = build_text_payload(build_bundle_prompt(topic), BUNDLE_MAX_TOKENS, json_mode=True,
+                              n=n, temperature=BUNDLE_TEMPERATURE)
+    if cache_get(cache_key(body)) is not None:
+        append_log("Blog text found in cache; skipping Batch API submission.\n")
+        return []
+
+    batch_requests = [{
+        "custom_id": "bundles",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body
+    }]
+    jsonl = b"\n".join(orjson.dumps(req) for req in batch_requests)
+
+    client = get_client().with_options(max_retries=BATCH_MAX_RETRIES)
+    input_file = await client.files.create(file=("batch_input.jsonl", jsonl), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
     )
-    return generate_text(prompt, max_tokens=50)
+    append_log(f"Batch {batch.id} submitted. Polling every {BATCH_POLL_INTERVAL} seconds...\n")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+        append_log(f"Batch {batch.id} status: {batch.status}\n")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        append_log(f"Batch {batch.id} ended with status '{batch.status}'.\n")
+        return []
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.content.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            append_log(f"Batch request failed: {record.get('error')}\n")
+            continue
+        raws = [choice["message"]["content"].strip() for choice in response["body"]["choices"]]
+        try:
+            bundles = [parse_bundle(raw) for raw in raws]
+        except orjson.JSONDecodeError as e:
+            append_log(f"Invalid JSON in batch output: {e}\n")
+            continue
+        cache_set(cache_key(body), raws)
+        return bundles
+    return []
 
 
 # -------------------------------------------------------------------
 # 使用 GPT-4o 生成封面图片（基于标题）/ Generate Cover Image using GPT-4o based on Title
 # -------------------------------------------------------------------
-def generate_cover_image_for_title(title: str, set_no: int) -> str:
+# DALL·E-3 最小尺寸即 1024x1024，使用 standard 质量（非 hd）以减小下载体积。
+# 1024x1024 is DALL·E-3's smallest size; "standard" quality (not "hd") keeps downloads small.
+COVER_IMAGE_PARAMS = {"model": "dall-e-3", "size": "1024x1024", "quality": "standard", "style": "natural"}
+
+# 嵌入 Word 前的封面最大边长（像素）/ Maximum cover edge length (px) before embedding in Word
+COVER_RESOLUTIONS = {"Draft (512)": 512, "Standard (1024)": 1024}
+
+
+# 允许常见无害字符（如 % / & 及撇号）；双引号、反引号、括号等替换为空格，换行由空白合并去除。
+# _COVER_PROMPT 用双引号包裹标题，因此清理后的标题无法闭合引号。
+# Common harmless characters (e.g. % / & and apostrophes) are kept; double quotes, backticks,
+# brackets etc. become spaces, and newlines disappear when whitespace is collapsed. _COVER_PROMPT
+# wraps the title in double quotes, so a cleaned title can never close the quote.
+_TITLE_UNSAFE_RE = re.compile(r"[^\w\s\-:,.!?'%/&+#]")
+COVER_TITLE_MAX_LEN = 80
+
+
+def clean_title(title: str) -> str:
+    """
+    清理并规范化模型生成的标题后再放入图片提示：将特殊字符替换为空格、合并空白并截断长度，
+    防止标题中的内容改写图片指令，也使相近的标题得到相同的缓存键。
+    Sanitize and normalize a model-generated title before it goes into the image prompt: replace
+    special characters with spaces, collapse whitespace and truncate, so the title cannot rewrite the image
+    instructions and near-identical titles share a cache key.
+
+    Args:
+      title (str): 生成的博客标题 / Generated blog title.
+
+    Returns:
+      clean (str): 清理后的标题 / Sanitized title.
+    """
+    clean = " ".join(_TITLE_UNSAFE_RE.sub(" ", title).split())
+    return clean[:COVER_TITLE_MAX_LEN].strip()
+
+
+def build_cover_prompt(title: str, set_no: int) -> str:
+    """
+    构建封面图片的生成提示：背景简单优雅，中央以大字显示标题，并按结果集编号变换背景。
+    标题会先经过 clean_title 处理；图片缓存键也由此提示生成。
+    Build the cover image prompt: simple elegant background, the title in large bold letters
+    in the center, with the background varied by set number. The title is passed through
+    clean_title first; the image cache key is derived from this prompt.
+
+    Args:
+      title (str): 生成的博客标题 / The blog title to display.
+      set_no (int): 结果集编号 / Set number.
+
+    Returns:
+      prompt (str): 提示文本 / Prompt text.
+    """
+    return _COVER_PROMPT.format(title=clean_title(title), set_no=set_no)
+
+
+@openai_retry
+async def generate_cover_image_for_title(title: str, set_no: int) -> str:
     """
     使用 GPT-4o 图像生成接口生成一张 1024x1024 封面图片，要求图片背景简单优雅，
     并在中央以大字显示生成的博客标题（title）。在提示中加入结果集编号以确保背景设计各异，
@@ -182,84 +694,185 @@ def generate_cover_image_for_title(title: str, set_no: int) -> str:
     Returns:
       image_url (str): 生成图片的 URL / URL of the generated image.
     """
-    prompt = (
-        f"Generate a 1024x1024 cover image with a simple, elegant background pattern. "
-        f"In the center, display the following text in large, bold letters: '{title}'. "
-        f"This is for variant {set_no}; vary the background style (different colors or patterns) "
-        "but ensure the displayed text is exactly the given title."
-    )
-    while True:
-        try:
-            response = openai.Image.create(
-                model="dall-e-3",  # 使用 DALL·E-3 接口生成图片，GPT-4o 可通过此接口调用
-                prompt=prompt,
-                n=1,
-                size="1024x1024",
-                response_format="url"
-            )
-            image_url = response["data"][0]["url"]
-            return image_url
-        except openai.error.RateLimitError:
-            append_log("Image generation rate limit reached. Waiting 10 seconds...\n")
-            time.sleep(10)
-        except Exception as e:
-            append_log(f"Error generating image with GPT-4o: {e}. Retrying in 10 seconds...\n")
-            time.sleep(10)
+    prompt = build_cover_prompt(title, set_no)
+    async with RPM_LIMITER:
+        response = await get_client().images.generate(
+            **COVER_IMAGE_PARAMS,  # 使用 DALL·E-3 接口生成图片，GPT-4o 可通过此接口调用
+            prompt=prompt,
+            n=1,
+            response_format="url"
+        )
+    image_url = response.data[0].url
+    return image_url
 
 
 # -------------------------------------------------------------------
 # 下载图片 / Download Image
 # -------------------------------------------------------------------
-def download_image(image_url: str) -> str:
+def download_image(image_url: str) -> bytes:
     """
-    根据图片 URL 下载图片，并保存为临时文件。
-    Download the image from the given URL and save it as a temporary file.
+    根据图片 URL 通过共享的连接池会话流式下载图片，直接返回内存中的图片字节（不写临时文件）。
+    Stream the image from the given URL through the pooled session and return its bytes in memory
+    (no temporary file).
 
     Args:
       image_url (str): 图片的 URL / Image URL.
 
     Returns:
-      temp_filename (str): 临时图片文件的路径 / Local path of the downloaded image.
-                           若下载失败则返回空字符串 / Returns empty string on failure.
+      image_bytes (bytes): 图片数据 / Image data.
+                           若下载失败则返回空字节串 / Returns empty bytes on failure.
     """
     try:
-        resp = requests.get(image_url)
-        if resp.status_code == 200:
-            temp_filename = f"temp_cover_image_set_{int(time.time())}.jpg"
-            with open(temp_filename, "wb") as f:
-                f.write(resp.content)
-            return temp_filename
-        else:
-            append_log(f"Failed to download image, status code: {resp.status_code}\n")
-            return ""
+        with get_http_session().get(image_url, stream=True, timeout=(5, 30)) as resp:
+            if resp.status_code == 200:
+                # 以 64 KiB 分块从 socket 拷贝到内存缓冲区 / Copy from the socket in 64 KiB chunks
+                resp.raw.decode_content = True
+                buf = io.BytesIO()
+                shutil.copyfileobj(resp.raw, buf, length=65536)
+                return buf.getvalue()
+            else:
+                append_log(f"Failed to download image, status code: {resp.status_code}\n")
+                return b""
     except Exception as e:
         append_log(f"Error downloading image: {e}\n")
-        return ""
+        return b""
+
+
+async def download_image_async(image_url: str) -> bytes:
+    """
+    在下载线程池中执行 download_image，使多张图片的下载可以并行进行。
+    Run download_image on the download thread pool so several downloads can proceed in parallel.
+
+    Args:
+      image_url (str): 图片的 URL / Image URL.
+
+    Returns:
+      image_bytes (bytes): 同 download_image / Same as download_image.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_download_pool, download_image, image_url)
+
+
+# -------------------------------------------------------------------
+# 获取封面图片（带缓存）/ Get Cover Image (Cached)
+# -------------------------------------------------------------------
+async def generate_cover_image_bytes(title: str, set_no: int) -> bytes:
+    """
+    生成并下载封面图片，返回图片字节。由于 DALL·E 的 URL 约 2 小时后失效，
+    缓存中保存的是下载后的图片字节，而不是 URL。
+    Generate and download the cover image, returning its bytes. DALL·E URLs expire after
+    about 2 hours, so the cache stores the downloaded image bytes rather than the URL.
+
+    Args:
+      title (str): 生成的博客标题 / The blog title to display.
+      set_no (int): 结果集编号 / Set number.
+
+    Returns:
+      image_bytes (bytes): 同 download_image / Same as download_image.
+    """
+    loop = asyncio.get_running_loop()
+    key = cache_key({**COVER_IMAGE_PARAMS, "prompt": build_cover_prompt(title, set_no)})
+    # 图片可达数 MB，缓存读写放到线程池中，避免阻塞事件循环
+    # Images can be several MB, so cache reads/writes run in a thread to keep the event loop free
+    cached = await loop.run_in_executor(None, cache_get, key)
+    if cached is not None:
+        append_log(f"[Set {set_no}] Cover image loaded from cache.\n")
+        return cached
+
+    image_url = await generate_cover_image_for_title(title, set_no)
+    # 拿到 URL 后立即开始下载 / Start the download as soon as the URL is available
+    download_task = asyncio.create_task(download_image_async(image_url))
+    append_log(f"[Set {set_no}] Cover image URL: {image_url}\n")
+
+    image_bytes = await download_task
+    if image_bytes:
+        append_log(f"[Set {set_no}] Cover image downloaded ({len(image_bytes) // 1024} KiB).\n")
+        await loop.run_in_executor(None, cache_set, key, image_bytes)
+    return image_bytes
+
+
+# -------------------------------------------------------------------
+# 压缩封面图片 / Downscale Cover Image for Embedding
+# -------------------------------------------------------------------
+def compress_cover_image(image_bytes: bytes, max_px: int) -> bytes:
+    """
+    将封面图片缩放到不超过 max_px 并重新编码为 JPEG（质量 85），减小嵌入 Word 后的体积。
+    DALL·E 返回的是 PNG，docx 会原样保存图片数据，因此重新编码效果明显。
+    Downscale the cover image to at most max_px and re-encode it as JPEG (quality 85) to shrink
+    the embedded size. DALL·E returns PNG and docx stores image data verbatim, so this pays off.
+
+    Args:
+      image_bytes (bytes): 原始图片数据 / Original image data.
+      max_px (int): 最大边长 / Maximum edge length in pixels.
+
+    Returns:
+      image_bytes (bytes): 压缩后的 JPEG 数据 / Compressed JPEG data.
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as im:
+        im = im.convert("RGB")
+    im.thumbnail((max_px, max_px), Image.LANCZOS)
+    out = io.BytesIO()
+    im.save(out, "JPEG", quality=85, optimize=True)
+    return out.getvalue()
+
+
+# -------------------------------------------------------------------
+# Word 文档模板 / Cached Word Document Template
+# -------------------------------------------------------------------
+_TEMPLATE_BYTES = None
+
+
+def _template():
+    """
+    返回一个基于缓存模板字节构建的新 Document，避免每次保存都从磁盘解析默认模板。
+    Return a fresh Document built from cached template bytes, so the default template is not
+    parsed from disk on every save.
+    """
+    from docx import Document
+
+    global _TEMPLATE_BYTES
+    if _TEMPLATE_BYTES is None:
+        buf = io.BytesIO()
+        Document().save(buf)
+        _TEMPLATE_BYTES = buf.getvalue()
+    return Document(io.BytesIO(_TEMPLATE_BYTES))
 
 
 # -------------------------------------------------------------------
 # 保存到 Word 文档 / Save Blog Results to Word Document
 # -------------------------------------------------------------------
-def save_blog_to_word_multiple(sets: list, filename: str = "generated_blog.docx"):
+def save_blog_to_word_multiple(sets: list, filename: str = "generated_blog.docx", cover_max_px: int = 1024):
     """
     将多个博客结果集（包括标题、注释、正文、封面图片）整合保存到一个 Word 文档中。
     Consolidate multiple blog result sets into a single Word document.
 
     Args:
-      sets (list): 每个元素为一个字典，包含 'title', 'annotation', 'content', 'cover_image_path'.
-                   / Each element is a dict with keys: 'title', 'annotation', 'content', 'cover_image_path'.
+      sets (list): 每个元素为一个字典，包含 'title', 'annotation', 'content', 'cover_image_bytes'.
+                   / Each element is a dict with keys: 'title', 'annotation', 'content', 'cover_image_bytes'.
       filename (str): 保存的 Word 文件名称 / The filename for the Word document.
+      cover_max_px (int): 嵌入前封面图片的最大边长 / Maximum cover edge length before embedding.
     """
-    doc = Document()
+    from docx.shared import Inches
+
+    doc = _template()
     doc.add_heading("Generated Blog Results", level=1)
     for i, result in enumerate(sets, start=1):
         full_title = f"Set {i}: {result['title']} - {result['annotation']}"
         doc.add_heading(full_title, level=2)
         doc.add_paragraph(result["content"])
-        if result["cover_image_path"] and os.path.exists(result["cover_image_path"]):
-            doc.add_heading("Cover Image:", level=3)
-            doc.add_picture(result["cover_image_path"], width=Inches(6))
-        doc.add_paragraph("")  # 添加空行 / Add an empty paragraph for separation.
+        if result["cover_image_bytes"]:
+            try:
+                cover = compress_cover_image(result["cover_image_bytes"], cover_max_px)
+            except (OSError, ValueError) as e:
+                # 图片数据无法解码（含 PIL.UnidentifiedImageError）时跳过封面
+                # Skip the cover if the image data cannot be decoded (includes PIL.UnidentifiedImageError)
+                append_log(f"[Set {i}] Cover image is unreadable ({e}); skipping it.\n")
+            else:
+                doc.add_heading("Cover Image:", level=3)
+                doc.add_picture(io.BytesIO(cover), width=Inches(6))
+        if i < len(sets):
+            doc.add_page_break()  # 每套结果另起一页 / Start each set on a new page.
     os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
     doc.save(filename)
     append_log(f"Blog results have been saved to {filename}\n")
@@ -270,68 +883,117 @@ def save_blog_to_word_multiple(sets: list, filename: str = "generated_blog.docx"
 # -------------------------------------------------------------------
 def start_generation():
     """
-    从 UI 获取博客主题，并依次生成 3 套博客结果：
-      1. 生成博客标题 (GPT-3.5-turbo, 加入编号确保独特)
-      2. 生成对应博客正文 (GPT-3.5-turbo)
-      3. 根据生成的标题生成封面图片 (使用 GPT-4o, 图片中央显示标题)
-      4. 生成注释说明 (GPT-3.5-turbo)
+    从 UI 获取博客主题，生成 3 套博客结果：
+      1. 一次流式调用（n=3）生成 3 套博客标题、正文和注释说明 (GPT-3.5-turbo, JSON 模式)
+      2. 每套标题一旦输出即并发生成封面图片 (使用 GPT-4o, 图片中央显示标题)，与正文生成重叠
     最后将所有结果整合保存至 Word 文档中。
 
-    Retrieve the blog topic from the UI, then sequentially generate three blog result sets:
-      1. Generate blog title.
-      2. Generate blog content.
-      3. Generate cover image based on the generated title (using GPT-4o).
-      4. Generate annotation.
+    Retrieve the blog topic from the UI, then generate three blog result sets:
+      1. Generate the title, content and annotation of all three sets in one streamed JSON-mode call (n=3).
+      2. Start each cover image (using GPT-4o) as soon as its title is streamed, overlapping the content.
     Finally, consolidate all results into a Word document.
     """
     topic = topic_entry.get().strip()
     if not topic:
         messagebox.showerror("Input Error", "Blog topic cannot be empty!")
         return
+    try:
+        max_requests_per_minute = int(rpm_entry.get())
+        max_tokens_per_minute = int(tpm_entry.get())
+        if max_requests_per_minute <= 0 or max_tokens_per_minute <= 0:
+            raise ValueError
+    except ValueError:
+        messagebox.showerror("Input Error", "Rate limits must be positive integers!")
+        return
+    configure_rate_limits(max_requests_per_minute, max_tokens_per_minute)
+
+    global cache_enabled
+    cache_enabled = use_cache_var.get()
 
     generate_button.config(state=tk.DISABLED)  # 禁用按钮 / Disable button
     append_log(f"Starting generation for topic: {topic}\n")
 
-    def worker():
-        results = []
-        for i in range(1, 4):
-            append_log(f"\n----- Generating Set {i} -----\n")
+    use_batch = use_batch_var.get()
+    cover_max_px = COVER_RESOLUTIONS[cover_resolution_var.get()]
 
-            # 生成标题 / Generate Title
-            title = generate_blog_title(topic, i)
-            append_log(f"[Set {i}] Title: {title}\n")
+    async def run_all() -> list:
+        cover_tasks = {}
 
-            # 生成正文 / Generate Content
-            content = generate_blog_content(topic, i)
-            append_log(f"[Set {i}] Content generated.\n")
+        def start_cover(set_no: int, title: str):
+            # 标题一出现就开始生成封面，使图片生成与正文流式生成重叠；标题变化（如重试）时重新生成
+            # Start the cover as soon as the title appears so it overlaps the content stream;
+            # restart it if the title changed (e.g. after a retry)
+            previous = cover_tasks.get(set_no)
+            if previous and previous[0] == title:
+                return
+            if previous:
+                previous[1].cancel()
+            append_log(f"[Set {set_no}] Title: {title}\n")
+            cover_tasks[set_no] = (title, asyncio.create_task(generate_cover_image_bytes(title, set_no)))
 
-            # 生成封面图片（使用生成的标题作为图片显示文字） / Generate Cover Image based on Title
-            image_url = generate_cover_image_for_title(title, i)
-            append_log(f"[Set {i}] Cover image URL: {image_url}\n")
+        try:
+            bundles = []
+            if use_batch:
+                # 文本走 Batch API，失败时回退到实时调用；图片仍走实时接口
+                # Text goes through the Batch API (falling back to real time on failure); images stay real time
+                bundles = await generate_blog_bundles_batch(topic, SET_COUNT)
+            if not bundles:
+                # 一次流式请求（n=3）生成 3 套文本 / One streamed request (n=3) generates the text for all 3 sets
+                bundles = await generate_blog_bundles(topic, SET_COUNT, on_title=start_cover)
+            for i, bundle in enumerate(bundles, start=1):
+                start_cover(i, bundle["title"])
+                append_log(f"[Set {i}] Content generated.\n")
+                append_log(f"[Set {i}] Annotation: {bundle['annotation']}\n")
+        except BaseException:
+            for _, task in cover_tasks.values():
+                task.cancel()
+            raise
 
-            cover_image_path = download_image(image_url)
-            if cover_image_path:
-                append_log(f"[Set {i}] Cover image downloaded: {cover_image_path}\n")
-            else:
+        # 等待 3 张并发生成的封面图片，某一张失败不影响其余结果
+        # Wait for the 3 concurrently generated covers; one failure does not abort the others
+        covers = await asyncio.gather(
+            *(cover_tasks[i][1] for i in range(1, len(bundles) + 1)),
+            return_exceptions=True
+        )
+        results = []
+        for i, (bundle, cover) in enumerate(zip(bundles, covers), start=1):
+            if isinstance(cover, Exception):
+                append_log(f"[Set {i}] Cover image generation failed: {cover}\n")
+                cover = None
+            elif not cover:
                 append_log(f"[Set {i}] Cover image download failed.\n")
+                cover = None
+            results.append({**bundle, "cover_image_bytes": cover})
+        return results
 
-            # 生成注释说明 / Generate Annotation
-            annotation = generate_annotation(topic, title, i)
-            append_log(f"[Set {i}] Annotation: {annotation}\n")
-
-            results.append({
-                "title": title,
-                "content": content,
-                "cover_image_path": cover_image_path,
-                "annotation": annotation
-            })
-            time.sleep(2)  # 等待避免频繁调用 / Pause briefly
+    def on_failure(error: Exception):
+        # 仅在 Tk 主线程中调用 / Runs on the Tk thread only
+        messagebox.showerror("Generation Error", f"Blog generation failed: {error}")
+        generate_button.config(state=tk.NORMAL)
 
-        save_blog_to_word_multiple(results)
-        append_log("All blog results generated and saved.\n")
+    def on_success():
+        # 仅在 Tk 主线程中调用 / Runs on the Tk thread only
         messagebox.showinfo("Success", "Blog results generated and saved successfully!")
         generate_button.config(state=tk.NORMAL)
 
+    def worker():
+        # 在后台事件循环上运行并等待结果，避免阻塞 Tk 主循环 / Run on the background loop, off the Tk thread
+        # 工作线程不直接操作 Tk，完成/失败处理通过 run_on_ui 交给主线程
+        # The worker never touches Tk; completion and failure are handed to the Tk thread via run_on_ui
+        try:
+            results = asyncio.run_coroutine_threadsafe(run_all(), _loop).result()
+            # 保存失败（如文档正在 Word 中打开导致 PermissionError）同样需要提示并恢复按钮
+            # Save failures (e.g. PermissionError while the file is open in Word) must also re-enable the button
+            save_blog_to_word_multiple(results, cover_max_px=cover_max_px)
+        except Exception as e:
+            # 重试次数用尽、不可重试的错误或保存失败 / Retries exhausted, a non-retryable error, or save failure
+            append_log(f"Generation failed: {e}\n")
+            run_on_ui(lambda error=e: on_failure(error))
+            return
+
+        append_log("All blog results generated and saved.\n")
+        run_on_ui(on_success)
+
     threading.Thread(target=worker, daemon=True).start()
 
 
@@ -342,7 +1004,7 @@ from tkinter import scrolledtext
 
 root = tk.Tk()
 root.title("AI Blog Generator with UI - English Version")
-root.geometry("700x550")
+root.geometry("700x710")
 
 topic_label = tk.Label(root, text="Enter Blog Topic (e.g., The Impact of AI on Digital Marketing):")
 topic_label.pack(pady=10)
@@ -350,11 +1012,44 @@ topic_label.pack(pady=10)
 topic_entry = tk.Entry(root, width=80)
 topic_entry.pack(pady=5)
 
+limits_frame = tk.Frame(root)
+limits_frame.pack(pady=5)
+tk.Label(limits_frame, text="Max requests/min:").pack(side=tk.LEFT)
+rpm_entry = tk.Entry(limits_frame, width=10)
+rpm_entry.insert(0, str(DEFAULT_MAX_REQUESTS_PER_MINUTE))
+rpm_entry.pack(side=tk.LEFT, padx=5)
+tk.Label(limits_frame, text="Max tokens/min:").pack(side=tk.LEFT)
+tpm_entry = tk.Entry(limits_frame, width=10)
+tpm_entry.insert(0, str(DEFAULT_MAX_TOKENS_PER_MINUTE))
+tpm_entry.pack(side=tk.LEFT, padx=5)
+
+use_batch_var = tk.BooleanVar()
+use_batch_check = tk.Checkbutton(
+    root, text="Use Batch API (50% cheaper text, may take up to 24h)", variable=use_batch_var
+)
+use_batch_check.pack(pady=5)
+
+use_cache_var = tk.BooleanVar()
+use_cache_check = tk.Checkbutton(
+    root, text="Reuse cached results for identical prompts (skips repeated API calls)", variable=use_cache_var
+)
+use_cache_check.pack(pady=5)
+
+resolution_frame = tk.Frame(root)
+resolution_frame.pack(pady=5)
+tk.Label(resolution_frame, text="Cover resolution:").pack(side=tk.LEFT)
+cover_resolution_var = tk.StringVar(value="Standard (1024)")
+for resolution_label in COVER_RESOLUTIONS:
+    tk.Radiobutton(
+        resolution_frame, text=resolution_label, variable=cover_resolution_var, value=resolution_label
+    ).pack(side=tk.LEFT, padx=5)
+
 generate_button = tk.Button(root, text="Generate Blog", command=start_generation)
 generate_button.pack(pady=10)
 
 log_text = scrolledtext.ScrolledText(root, width=80, height=20)
 log_text.pack(pady=10)
+root.after(LOG_DRAIN_INTERVAL_MS, _drain_log)
 
 #start gui
 root.mainloop()